@@ -1,6 +1,6 @@
+import asyncio
 import logging
 import os
-import traceback
 from pathlib import Path
 
 # Load .env from project root so OPENAI_API_KEY, OPENAI_BASE_URL, OLLAMA_BASE_URL, etc. are available when running locally
@@ -20,22 +20,95 @@ def _load_dotenv():
 _load_dotenv()
 
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import Any, Dict, List, Optional
-from rlm_facts import extract_facts_and_drift, _get_model_info
+from typing import Any, Dict, List, Optional, Union
+from rlm_facts import (
+    UnknownFactsHashError,
+    extract_facts_and_drift_async,
+    _get_model_info,
+    _get_async_client,
+    _get_gliner,
+    _get_nli,
+    _get_embedder,
+    _loaded_models,
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="facts-worker")
+# orjson serializes responses several times faster than stdlib json; the
+# facts/drift payloads are plain dicts of strings/floats, so it's a drop-in.
+app = FastAPI(title="facts-worker", default_response_class=ORJSONResponse)
 
-_busy = False
+# Upper bound on concurrent in-flight LLM calls for a single batch request
+FACTS_MAX_PARALLEL = max(1, int(os.getenv("FACTS_MAX_PARALLEL", "16")))
+
+# Per-process cap on concurrent /extract requests. Excess requests queue at
+# the semaphore instead of piling onto the backend, which is what turns a
+# burst into an exponential latency blowup. The counter is per worker
+# process, like everything else in /health.
+MAX_INFLIGHT = max(1, int(os.getenv("MAX_INFLIGHT", "16")))
+_inflight = 0
+_extract_sem: Optional[asyncio.Semaphore] = None
+_extract_sem_loop: Optional[Any] = None
+
+
+def _get_extract_sem() -> asyncio.Semaphore:
+    # Bound to one event loop; rebuilt when called from a new one (test clients).
+    global _extract_sem, _extract_sem_loop
+    loop = asyncio.get_running_loop()
+    if _extract_sem is None or _extract_sem_loop is not loop:
+        _extract_sem_loop = loop
+        _extract_sem = asyncio.Semaphore(MAX_INFLIGHT)
+    return _extract_sem
+
+
+def _error_content(e: Exception) -> Dict[str, Any]:
+    """Error body for 500s: message only, traceback included when FACTS_DEBUG is set."""
+    content: Dict[str, Any] = {"error": str(e)}
+    if os.getenv("FACTS_DEBUG", "").lower() in ("1", "true", "yes"):
+        import traceback
+        content["detail"] = traceback.format_exc()
+    return content
+
+
+def _unknown_hash_content(e: UnknownFactsHashError) -> Dict[str, Any]:
+    """422 body with a stable code so clients fall back to a full previous_facts dict."""
+    return {"error": str(e), "code": "unknown_previous_facts_hash"}
 
 
 class ExtractReq(BaseModel):
     context: List[Dict[str, Any]]
-    previous_facts: Optional[Dict[str, Any]] = None
+    # A string is a by-hash reference to a previously returned facts snapshot
+    previous_facts: Optional[Union[Dict[str, Any], str]] = None
+
+
+class ExtractBatchReq(BaseModel):
+    items: List[ExtractReq]
+
+
+@app.on_event("startup")
+async def _warm_connection():
+    """Prime the LLM connection pool so the first extract skips the TLS handshake."""
+    try:
+        await _get_async_client().with_options(timeout=5.0).models.list()
+    except Exception:
+        logger.debug("connection pre-warm failed", exc_info=True)
+
+
+@app.on_event("startup")
+async def _warm_models():
+    """Load the optional NER/NLI/embedding models in parallel before serving.
+
+    Keeps multi-second checkpoint loads out of the first real request; each
+    getter is a cheap no-op in the default SKIP_* configuration.
+    """
+    await asyncio.gather(
+        asyncio.to_thread(_get_gliner),
+        asyncio.to_thread(_get_nli),
+        asyncio.to_thread(_get_embedder),
+    )
 
 
 @app.get("/health")
@@ -59,24 +132,48 @@ def health():
         "model": model_name,
         "backend": backend,
         "capabilities": capabilities,
-        "busy": _busy,
+        "models_loaded": _loaded_models(),
+        "inflight": _inflight,
+        "max_inflight": MAX_INFLIGHT,
     }
 
 
 @app.post("/extract")
-def extract(req: ExtractReq):
-    global _busy
-    _busy = True
-    try:
-        facts, drift = extract_facts_and_drift(req.context, req.previous_facts)
-        return {"facts": facts, "drift": drift}
-    except Exception as e:
-        msg = str(e)
-        tb = traceback.format_exc()
-        logger.error("extract failed: %s\n%s", msg, tb)
-        return JSONResponse(
-            status_code=500,
-            content={"error": msg, "detail": tb},
-        )
-    finally:
-        _busy = False
+async def extract(req: ExtractReq):
+    global _inflight
+    async with _get_extract_sem():
+        _inflight += 1
+        try:
+            facts, drift = await extract_facts_and_drift_async(req.context, req.previous_facts)
+            return {"facts": facts, "drift": drift}
+        except UnknownFactsHashError as e:
+            # Hash references only resolve in the worker process that issued
+            # them; a miss is the client's cue to resend the full dict.
+            return ORJSONResponse(status_code=422, content=_unknown_hash_content(e))
+        except Exception as e:
+            # logger.exception defers traceback assembly to the logging handler;
+            # formatting the stack inline per failed request is wasted work when
+            # an LLM outage sends every request down this path.
+            logger.exception("extract failed")
+            return ORJSONResponse(status_code=500, content=_error_content(e))
+        finally:
+            _inflight -= 1
+
+
+@app.post("/extract_batch")
+async def extract_batch(req: ExtractBatchReq):
+    sem = asyncio.Semaphore(FACTS_MAX_PARALLEL)
+
+    async def _one(item: ExtractReq) -> Dict[str, Any]:
+        async with sem:
+            try:
+                facts, drift = await extract_facts_and_drift_async(item.context, item.previous_facts)
+                return {"facts": facts, "drift": drift}
+            except UnknownFactsHashError as e:
+                return _unknown_hash_content(e)
+            except Exception as e:
+                logger.exception("extract_batch item failed")
+                return _error_content(e)
+
+    results = await asyncio.gather(*(_one(item) for item in req.items))
+    return {"results": results}
@@ -0,0 +1,106 @@
+"""Request-coalescing micro-batch layer in front of the LLM call.
+
+Concurrent /extract requests landing within a small time window are sent as
+one multi-context completion instead of N separate ones, amortizing the HTTP
+round-trip and the shared instruction prefix. Waiters enqueue their prompt
+halves and await a Future that resolves to the raw facts-JSON string for
+their slot. If the model returns the wrong number of results (or fails),
+every item in the batch falls back to an individual call.
+"""
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+BATCH_MAX = max(1, int(os.getenv("FACTS_BATCH_MAX", "8")))
+BATCH_WINDOW_MS = max(0, int(os.getenv("FACTS_BATCH_WINDOW_MS", "25")))
+
+MultiCall = Callable[[List[Tuple[str, str]]], Awaitable[List[str]]]
+SingleCall = Callable[[str, str], Awaitable[str]]
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        multi_call: MultiCall,
+        single_call: SingleCall,
+        max_batch: int = BATCH_MAX,
+        window_ms: int = BATCH_WINDOW_MS,
+    ):
+        self._multi_call = multi_call
+        self._single_call = single_call
+        self._max_batch = max_batch
+        self._window_s = window_ms / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Strong refs to in-flight dispatch tasks (asyncio only keeps weak ones)
+        self._dispatches: set = set()
+
+    async def call(self, prompt_context: str, prompt_previous: str) -> str:
+        """Enqueue one request and await its slot of the batched reply."""
+        loop = asyncio.get_running_loop()
+        self._ensure_worker(loop)
+        fut: asyncio.Future = loop.create_future()
+        await self._queue.put((prompt_context, prompt_previous, fut))
+        return await fut
+
+    def _ensure_worker(self, loop: asyncio.AbstractEventLoop) -> None:
+        # The queue and worker task are bound to one event loop; rebuild them
+        # if we are called from a new loop (e.g. across test clients).
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._dispatches = set()
+            self._task = loop.create_task(self._worker())
+        elif self._task is None or self._task.done():
+            self._task = loop.create_task(self._worker())
+
+    async def _worker(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self._window_s
+            while len(batch) < self._max_batch:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # Dispatch in its own task so the next batch starts collecting
+            # while this one's LLM round-trip is in flight; awaiting here
+            # would cap throughput at one batch per round-trip.
+            task = self._loop.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: List[Tuple[str, str, asyncio.Future]]) -> None:
+        if len(batch) == 1:
+            ctx, prev, fut = batch[0]
+            await self._resolve_single(ctx, prev, fut)
+            return
+        try:
+            results = await self._multi_call([(ctx, prev) for ctx, prev, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(
+                    f"batched LLM reply had {len(results)} results for {len(batch)} items"
+                )
+        except Exception:
+            # Wrong shape or hard failure: re-submit every item individually,
+            # in parallel — serializing them would stall the whole batch for
+            # up to max_batch round-trips.
+            await asyncio.gather(
+                *(self._resolve_single(ctx, prev, fut) for ctx, prev, fut in batch)
+            )
+            return
+        for (_, _, fut), raw in zip(batch, results):
+            if not fut.done():
+                fut.set_result(raw)
+
+    async def _resolve_single(self, ctx: str, prev: str, fut: asyncio.Future) -> None:
+        if fut.done():
+            return
+        try:
+            fut.set_result(await self._single_call(ctx, prev))
+        except Exception as e:
+            fut.set_exception(e)
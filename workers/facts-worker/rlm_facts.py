@@ -1,10 +1,14 @@
 import os
-import json
+import time
+import functools
+import asyncio
 import hashlib
-from typing import List, Optional, Dict, Any, Tuple
-from datetime import datetime
+import threading
+import orjson
+from collections import OrderedDict
+from typing import List, Optional, Dict, Any, Tuple, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 
 # -----------------------------
 # LLM client (OpenAI-compatible; works with OpenAI API and Ollama /v1)
@@ -14,47 +18,405 @@ EXTRACTION_TIMEOUT_SEC = max(30, int(os.getenv("EXTRACTION_TIMEOUT_SEC", "180"))
 EXTRACTION_CONTEXT_MAX_CHARS = int(os.getenv("EXTRACTION_CONTEXT_MAX_CHARS", "24000"))
 
 
+@functools.lru_cache(maxsize=1)
 def _get_model_info() -> Tuple[str, str]:
-    """Return (model_name, backend) where backend is 'ollama' or 'openai'."""
+    """Return (model_name, backend) where backend is 'ollama' or 'openai'.
+
+    Memoized — the backend config is fixed for the process lifetime;
+    reset_client() clears it for tests that switch env vars.
+    """
     ollama_base = os.getenv("OLLAMA_BASE_URL", "").strip()
     if ollama_base:
         return os.getenv("EXTRACTION_MODEL", "qwen3:8b"), "ollama"
     return os.getenv("OPENAI_MODEL", "gpt-4o-mini"), "openai"
 
 
-def _call_llm(prompt_context: str, prompt_previous: str) -> str:
-    """Call an OpenAI-compatible chat/completions endpoint. Uses Ollama when OLLAMA_BASE_URL is set."""
-    from openai import OpenAI
-
+def _client_kwargs() -> Tuple[Dict[str, Any], str]:
+    """Return (client kwargs, model name) for the configured backend."""
     ollama_base = os.getenv("OLLAMA_BASE_URL", "").strip()
     if ollama_base:
-        client = OpenAI(
-            api_key="ollama",
-            base_url=f"{ollama_base.rstrip('/')}/v1",
-            timeout=float(EXTRACTION_TIMEOUT_SEC),
-        )
+        kwargs = {
+            "api_key": "ollama",
+            "base_url": f"{ollama_base.rstrip('/')}/v1",
+            "timeout": float(EXTRACTION_TIMEOUT_SEC),
+        }
         model = os.getenv("EXTRACTION_MODEL", "qwen3:8b")
     else:
-        client = OpenAI(
-            api_key=os.getenv("OPENAI_API_KEY"),
-            base_url=os.getenv("OPENAI_BASE_URL") or None,
-            timeout=float(EXTRACTION_TIMEOUT_SEC),
-        )
+        kwargs = {
+            "api_key": os.getenv("OPENAI_API_KEY"),
+            "base_url": os.getenv("OPENAI_BASE_URL") or None,
+            "timeout": float(EXTRACTION_TIMEOUT_SEC),
+        }
         model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    return kwargs, model
+
+
+# Fixed instruction prose lives in the system message so provider prefix
+# caches (OpenAI/vLLM/Ollama) hit on it across requests; the user message
+# carries only the variable JSON.
+SYSTEM_MSG = (
+    "You extract structured facts. Reply with a single JSON object only"
+    " (no markdown, no explanation) with these keys: entities (list of"
+    " strings), claims (list), risks (list), assumptions (list),"
+    " contradictions (list), goals (list), confidence (float 0-1)."
+)
+
 
-    user_content = f"""Context (recent events as JSON):
+def _build_user_content(prompt_context: str, prompt_previous: str) -> str:
+    return f"""Context (recent events as JSON):
 {prompt_context}
 
 Previous facts (JSON):
-{prompt_previous}
+{prompt_previous}"""
+
+
+def _extraction_messages(
+    prompt_context: str,
+    prompt_previous: str,
+    feedback: Optional[List[Dict[str, str]]] = None,
+) -> List[Dict[str, str]]:
+    messages = [
+        {"role": "system", "content": SYSTEM_MSG},
+        {"role": "user", "content": _build_user_content(prompt_context, prompt_previous)},
+    ]
+    if feedback:
+        messages.extend(feedback)
+    return messages
+
+
+# Stream completions so runaway generations can be cut off early instead of
+# paying for the full reply. FACTS_STREAM=0 falls back to one-shot responses.
+_STREAM_ENABLED = os.getenv("FACTS_STREAM", "1").lower() in ("1", "true", "yes")
+_STREAM_MAX_BYTES = int(os.getenv("FACTS_STREAM_MAX_BYTES", "65536"))
+
+
+class LLMStreamError(ValueError):
+    """Raised when a streamed reply is aborted early; carries the partial output."""
+
+    def __init__(self, message: str, partial: str):
+        super().__init__(message)
+        self.partial = partial
+
+
+class _StreamAccumulator:
+    """Collects streamed delta chunks, failing fast on non-JSON or oversized output.
+
+    Tracks brace depth (string- and escape-aware) as tokens arrive so callers
+    can abandon the stream the moment the top-level object closes, instead of
+    draining trailing prose some models append after the JSON.
+    """
+
+    def __init__(self):
+        self._parts: List[str] = []
+        self._total = 0
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self.done = False
+
+    def feed(self, delta: str) -> None:
+        if not delta or self.done:
+            return
+        if not self._started:
+            stripped = delta.lstrip()
+            if stripped:
+                if not stripped.startswith("{"):
+                    raise LLMStreamError(
+                        f"LLM stream does not start with a JSON object: {stripped[:80]!r}",
+                        "".join(self._parts) + delta,
+                    )
+                self._started = True
+        self._parts.append(delta)
+        self._total += len(delta)
+        if self._total > _STREAM_MAX_BYTES:
+            raise LLMStreamError(
+                f"LLM stream exceeded {_STREAM_MAX_BYTES} bytes",
+                "".join(self._parts),
+            )
+        if self._started:
+            self._scan(delta)
+
+    def _scan(self, delta: str) -> None:
+        for ch in delta:
+            if self._escaped:
+                self._escaped = False
+            elif ch == "\\":
+                self._escaped = self._in_string
+            elif ch == '"':
+                self._in_string = not self._in_string
+            elif not self._in_string:
+                if ch == "{":
+                    self._depth += 1
+                elif ch == "}":
+                    self._depth -= 1
+                    if self._depth == 0:
+                        self.done = True
+                        return
+
+    def result(self) -> str:
+        return "".join(self._parts).strip() or "{}"
+
+
+def _delta_content(chunk: Any) -> Optional[str]:
+    if not getattr(chunk, "choices", None):
+        return None
+    return chunk.choices[0].delta.content
+
+
+def _get_sync_client():
+    """Shared OpenAI client: one connection pool, built once per process."""
+    s = _S
+    if s.sync_client is None:
+        with s.client_lock:
+            if s.sync_client is None:
+                import httpx
+                from openai import OpenAI
+
+                kwargs, _ = _client_kwargs()
+                s.sync_client = OpenAI(
+                    **kwargs,
+                    http_client=httpx.Client(
+                        timeout=kwargs["timeout"],
+                        limits=httpx.Limits(
+                            max_connections=100,
+                            max_keepalive_connections=40,
+                            keepalive_expiry=60,
+                        ),
+                    ),
+                )
+    return s.sync_client
+
+
+def reset_client() -> None:
+    """Drop cached clients and memoized backend info (for tests/env changes)."""
+    s = _S
+    with s.client_lock:
+        s.sync_client = None
+        s.async_client = None
+        s.batcher = None
+    _get_model_info.cache_clear()
 
-Extract structured facts. Reply with a single JSON object only (no markdown, no explanation) with these keys: entities (list of strings), claims (list), risks (list), assumptions (list), contradictions (list), goals (list), confidence (float 0-1)."""
-    resp = client.chat.completions.create(
+
+def _call_llm(
+    prompt_context: str,
+    prompt_previous: str,
+    feedback: Optional[List[Dict[str, str]]] = None,
+) -> str:
+    """Call an OpenAI-compatible chat/completions endpoint. Uses Ollama when OLLAMA_BASE_URL is set."""
+    client = _get_sync_client()
+    _, model = _client_kwargs()
+    messages = _extraction_messages(prompt_context, prompt_previous, feedback)
+    if not _STREAM_ENABLED:
+        resp = client.chat.completions.create(
+            model=model,
+            messages=messages,
+            response_format={"type": "json_object"},
+        )
+        return (resp.choices[0].message.content or "{}").strip()
+
+    stream = client.chat.completions.create(
         model=model,
-        messages=[{"role": "user", "content": user_content}],
+        messages=messages,
+        response_format={"type": "json_object"},
+        stream=True,
+    )
+    acc = _StreamAccumulator()
+    try:
+        for chunk in stream:
+            acc.feed(_delta_content(chunk) or "")
+            if acc.done:
+                stream.close()
+                break
+    except LLMStreamError:
+        stream.close()
+        raise
+    return acc.result()
+
+
+def _get_async_client():
+    """Shared AsyncOpenAI client: one connection pool, built once per process."""
+    s = _S
+    if s.async_client is None:
+        with s.client_lock:
+            if s.async_client is None:
+                import httpx
+                from openai import AsyncOpenAI
+
+                kwargs, _ = _client_kwargs()
+                s.async_client = AsyncOpenAI(
+                    **kwargs,
+                    http_client=httpx.AsyncClient(
+                        timeout=kwargs["timeout"],
+                        limits=httpx.Limits(
+                            max_connections=100,
+                            max_keepalive_connections=40,
+                            keepalive_expiry=60,
+                        ),
+                    ),
+                )
+    return s.async_client
+
+
+async def _call_llm_async(
+    prompt_context: str,
+    prompt_previous: str,
+    feedback: Optional[List[Dict[str, str]]] = None,
+) -> str:
+    """Async variant of _call_llm; yields to the event loop during the HTTP round-trip."""
+    client = _get_async_client()
+    _, model = _client_kwargs()
+    messages = _extraction_messages(prompt_context, prompt_previous, feedback)
+    if not _STREAM_ENABLED:
+        resp = await client.chat.completions.create(
+            model=model,
+            messages=messages,
+            response_format={"type": "json_object"},
+        )
+        return (resp.choices[0].message.content or "{}").strip()
+
+    stream = await client.chat.completions.create(
+        model=model,
+        messages=messages,
         response_format={"type": "json_object"},
+        stream=True,
     )
-    return (resp.choices[0].message.content or "{}").strip()
+    acc = _StreamAccumulator()
+    try:
+        async for chunk in stream:
+            acc.feed(_delta_content(chunk) or "")
+            if acc.done:
+                await stream.close()
+                break
+    except LLMStreamError:
+        await stream.close()
+        raise
+    return acc.result()
+
+
+# -----------------------------
+# Extraction cache (content-addressable: identical model+prompts -> cached raw LLM reply)
+# -----------------------------
+
+_EXTRACT_CACHE_MAX = int(os.getenv("FACTS_CACHE_SIZE", "256"))
+_extract_cache: "OrderedDict[str, str]" = OrderedDict()
+
+_CACHE_KEY_VERSION = b"v1"
+
+
+def _extraction_cache_key(model: str, prompt_context: str, prompt_previous: str) -> str:
+    """SHA-256 over (version, model, context prompt, previous-facts prompt).
+
+    Each field is preceded by an 8-byte big-endian length so distinct
+    field splits can never collide on concatenation boundaries.
+    """
+    h = hashlib.sha256()
+    for field in (_CACHE_KEY_VERSION, model.encode(), prompt_context.encode(), prompt_previous.encode()):
+        h.update(len(field).to_bytes(8, "big"))
+        h.update(field)
+    return h.hexdigest()
+
+
+def _extract_cache_get(key: str) -> Optional[str]:
+    if _EXTRACT_CACHE_MAX <= 0:
+        return None
+    val = _extract_cache.get(key)
+    if val is not None:
+        _extract_cache.move_to_end(key)
+    return val
+
+
+def _extract_cache_put(key: str, facts_json_str: str) -> None:
+    if _EXTRACT_CACHE_MAX <= 0:
+        return
+    _extract_cache[key] = facts_json_str
+    _extract_cache.move_to_end(key)
+    while len(_extract_cache) > _EXTRACT_CACHE_MAX:
+        _extract_cache.popitem(last=False)
+
+
+# Facts snapshots by their own hash, so clients can send {"hash"}-style
+# string references instead of replaying the whole previous_facts dict.
+_facts_by_hash: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+
+def _facts_by_hash_put(facts_hash: Optional[str], facts: Dict[str, Any]) -> None:
+    if _EXTRACT_CACHE_MAX <= 0 or not facts_hash:
+        return
+    _facts_by_hash[facts_hash] = facts
+    _facts_by_hash.move_to_end(facts_hash)
+    while len(_facts_by_hash) > _EXTRACT_CACHE_MAX:
+        _facts_by_hash.popitem(last=False)
+
+
+class UnknownFactsHashError(ValueError):
+    """A previous_facts hash reference not present in this process's store.
+
+    A client error, not a server fault: the store is per-process and LRU-
+    bounded, so callers must be ready to fall back to sending the full
+    previous_facts dict (e.g. after a restart or when another worker
+    process answered the earlier request).
+    """
+
+
+def _resolve_previous_facts(
+    previous_facts: Optional[Union[Dict[str, Any], str]],
+) -> Optional[Dict[str, Any]]:
+    """Resolve a by-hash string reference to the stored facts snapshot."""
+    if not isinstance(previous_facts, str):
+        return previous_facts
+    facts = _facts_by_hash.get(previous_facts)
+    if facts is None:
+        raise UnknownFactsHashError(f"unknown previous_facts hash: {previous_facts}")
+    _facts_by_hash.move_to_end(previous_facts)
+    return facts
+
+
+# Whole-result (facts, drift) cache keyed by content fingerprints of the
+# limited context and previous facts. Unlike the raw-reply cache above this
+# also skips NER/NLI/drift on a hit, but it can mask nondeterminism in those
+# stages, so it is off unless CACHE_MAX is set.
+_RESULT_CACHE_MAX = max(0, int(os.getenv("CACHE_MAX", "0")))
+_result_cache: "OrderedDict[Tuple[str, str], Tuple[Dict[str, Any], Dict[str, Any]]]" = OrderedDict()
+
+
+def _result_cache_key(
+    context_limited: List[Dict[str, Any]],
+    previous_facts: Optional[Dict[str, Any]],
+) -> Tuple[str, str]:
+    return (stable_hash(context_limited), stable_hash(previous_facts or {}))
+
+
+def _result_cache_get(key: Tuple[str, str]) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    if _RESULT_CACHE_MAX <= 0:
+        return None
+    hit = _result_cache.get(key)
+    if hit is None:
+        return None
+    _result_cache.move_to_end(key)
+    facts, drift = hit
+    # Deep-copy so callers can't mutate the cached entry; refresh the
+    # timestamp (the hash stays that of the original snapshot).
+    facts = orjson.loads(orjson.dumps(facts))
+    facts["updated_at"] = _iso_utc_now()
+    return facts, orjson.loads(orjson.dumps(drift))
+
+
+def _result_cache_put(
+    key: Tuple[str, str], facts: Dict[str, Any], drift: Dict[str, Any]
+) -> None:
+    if _RESULT_CACHE_MAX <= 0:
+        return
+    _result_cache[key] = (facts, drift)
+    _result_cache.move_to_end(key)
+    while len(_result_cache) > _RESULT_CACHE_MAX:
+        _result_cache.popitem(last=False)
+
+
+def clear_extraction_cache() -> None:
+    _extract_cache.clear()
+    _facts_by_hash.clear()
+    _result_cache.clear()
 
 
 # -----------------------------
@@ -63,6 +425,10 @@ Extract structured facts. Reply with a single JSON object only (no markdown, no
 
 
 class Facts(BaseModel):
+    # Extra keys in LLM output are dropped, not errors (explicit so a pydantic
+    # default change can't start failing extractions).
+    model_config = ConfigDict(extra="ignore")
+
     version: int = 2
     updated_at: str = ""
     entities: List[str] = Field(default_factory=list)
@@ -88,20 +454,99 @@ class Drift(BaseModel):
 # -----------------------------
 
 
+def _dedupe_events(context: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop exact-duplicate events (upstream retry storms replay the same payload).
+
+    Events are fingerprinted with a 16-byte blake2b over their sorted-key
+    serialization; order of first occurrence is preserved.
+    """
+    seen: set = set()
+    out: List[Dict[str, Any]] = []
+    for ev in context:
+        try:
+            h = hashlib.blake2b(orjson.dumps(ev, option=orjson.OPT_SORT_KEYS), digest_size=16).digest()
+        except TypeError:
+            out.append(ev)
+            continue
+        if h in seen:
+            continue
+        seen.add(h)
+        out.append(ev)
+    return out
+
+
+FACTS_MAX_EVENTS = int(os.getenv("FACTS_MAX_EVENTS", "32"))
+FACTS_MAX_CHARS = int(os.getenv("FACTS_MAX_CHARS", "4000"))
+
+_TEXT_KEYS = ("content", "text", "excerpt", "body")
+
+
+def _trim_context(
+    context: List[Dict[str, Any]],
+    max_events: int = FACTS_MAX_EVENTS,
+    max_chars_per_event: int = FACTS_MAX_CHARS,
+) -> List[Dict[str, Any]]:
+    """Keep the last max_events events and cap each event's text fields.
+
+    LLM prefill time is roughly linear in input tokens, so oversized events
+    are cut before serialization. Events are shallow-copied only when a
+    field actually needs truncating.
+    """
+    trimmed = context[-max_events:] if max_events > 0 else context
+    if max_chars_per_event <= 0:
+        return list(trimmed)
+    out: List[Dict[str, Any]] = []
+    for ev in trimmed:
+        if not isinstance(ev, dict):
+            out.append(ev)
+            continue
+        ev_copy: Optional[Dict[str, Any]] = None
+        for key in _TEXT_KEYS:
+            v = ev.get(key)
+            if isinstance(v, str) and len(v) > max_chars_per_event:
+                if ev_copy is None:
+                    ev_copy = dict(ev)
+                ev_copy[key] = v[:max_chars_per_event]
+        payload = ev.get("payload")
+        if isinstance(payload, dict):
+            payload_copy: Optional[Dict[str, Any]] = None
+            for key in _TEXT_KEYS:
+                v = payload.get(key)
+                if isinstance(v, str) and len(v) > max_chars_per_event:
+                    if payload_copy is None:
+                        payload_copy = dict(payload)
+                    payload_copy[key] = v[:max_chars_per_event]
+            if payload_copy is not None:
+                if ev_copy is None:
+                    ev_copy = dict(ev)
+                ev_copy["payload"] = payload_copy
+        out.append(ev_copy if ev_copy is not None else ev)
+    return out
+
+
 def _truncate_context_for_prompt(context: List[Dict[str, Any]], max_chars: int) -> List[Dict[str, Any]]:
-    """Keep last events that fit within max_chars (newest first)."""
-    if max_chars <= 0:
+    """Keep last events that fit within max_chars (newest first).
+
+    Each event is serialized once; the kept suffix is found by summing
+    per-event lengths from the tail (plus commas/brackets), instead of
+    re-serializing a growing list per step.
+    """
+    if max_chars <= 0 or not context:
         return context
-    compact = json.dumps(context, separators=(",", ":"), ensure_ascii=False)
-    if len(compact) <= max_chars:
+    lens = [len(orjson.dumps(ev)) for ev in context]
+    if sum(lens) + len(context) + 1 <= max_chars:  # items + commas + brackets
         return context
-    out: List[Dict[str, Any]] = []
+    total = 2  # "[]"
+    kept = 0
+    start = len(context)
     for i in range(len(context) - 1, -1, -1):
-        out.insert(0, context[i])
-        if len(json.dumps(out, separators=(",", ":"), ensure_ascii=False)) > max_chars:
-            out.pop(0)
+        add = lens[i] + (1 if kept else 0)
+        if total + add > max_chars:
             break
-    return out if out else context[:1]
+        total += add
+        kept += 1
+        start = i
+    return context[start:] if kept else context[-1:]
 
 
 # -----------------------------
@@ -109,56 +554,194 @@ def _truncate_context_for_prompt(context: List[Dict[str, Any]], max_chars: int)
 # -----------------------------
 
 
+def _iso_utc_now() -> str:
+    """UTC timestamp like 2025-01-01T00:00:00.000000Z, composed from time_ns.
+
+    Skips the datetime allocation + isoformat + suffix-replace chain; the
+    wire format is unchanged.
+    """
+    s, ns = divmod(time.time_ns(), 1_000_000_000)
+    t = time.gmtime(s)
+    return (
+        f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}"
+        f"T{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}.{ns // 1000:06d}Z"
+    )
+
+
+try:
+    # xxh3 is several times faster than blake2b on the multi-KB snapshot
+    # payloads hashed here; both are fingerprints only (drift/change
+    # detection), not cryptographic or cross-ecosystem identity hashes.
+    import xxhash
+
+    def _fingerprint(data: bytes) -> str:
+        return xxhash.xxh3_128_hexdigest(data)
+except ImportError:
+    def _fingerprint(data: bytes) -> str:
+        return hashlib.blake2b(data, digest_size=32).hexdigest()
+
+
 def stable_hash(obj: Any) -> str:
-    b = json.dumps(obj, sort_keys=True, ensure_ascii=False).encode("utf-8")
-    return hashlib.sha256(b).hexdigest()
+    """Content fingerprint for drift detection (not a cross-ecosystem identity hash)."""
+    return _fingerprint(orjson.dumps(obj, option=orjson.OPT_SORT_KEYS))
 
 
 # -----------------------------
-# GLiNER2 NER (optional -- requires requirements-full.txt)
+# Lazy per-process state
 # -----------------------------
 
-_gliner_model = None
+
+class _State:
+    """Per-process lazy singletons (loaded models, clients) in one place.
+
+    Request paths bind this to a local once instead of touching several
+    module globals, and new fields (locks included) stay next to the
+    state they protect.
+    """
+
+    __slots__ = (
+        "gliner",
+        "nli",
+        "embedder",
+        "sync_client",
+        "async_client",
+        "batcher",
+        "gliner_lock",
+        "nli_lock",
+        "embedder_lock",
+        "client_lock",
+    )
+
+    def __init__(self):
+        self.gliner = None
+        self.nli = None
+        self.embedder = None
+        self.sync_client = None
+        self.async_client = None
+        self.batcher = None
+        self.gliner_lock = threading.Lock()
+        self.nli_lock = threading.Lock()
+        self.embedder_lock = threading.Lock()
+        self.client_lock = threading.Lock()
+
+
+_S = _State()
+
+
+# Torch inference (GLiNER/NLI) is CPU/GPU-bound; unbounded to_thread fan-out
+# under burst load thrashes caches and stretches tail latency. NN_CONCURRENCY
+# sizes the gate to accelerator capacity — pin it alongside
+# OLLAMA_NUM_PARALLEL when sharing a GPU with the model server.
+_NN_CONCURRENCY = max(1, int(os.getenv("NN_CONCURRENCY", "1")))
+_nn_sem: Optional[asyncio.Semaphore] = None
+_nn_sem_loop: Optional[Any] = None
+
+
+def _get_nn_sem() -> asyncio.Semaphore:
+    # The semaphore binds to one event loop; rebuild it if called from a new
+    # loop (e.g. across test clients), mirroring the micro-batcher.
+    global _nn_sem, _nn_sem_loop
+    loop = asyncio.get_running_loop()
+    if _nn_sem is None or _nn_sem_loop is not loop:
+        _nn_sem_loop = loop
+        _nn_sem = asyncio.Semaphore(_NN_CONCURRENCY)
+    return _nn_sem
+
+
+async def _run_nn(fn, *args):
+    """Run a torch-inference callable on a worker thread, gated by NN_CONCURRENCY."""
+    async with _get_nn_sem():
+        return await asyncio.to_thread(fn, *args)
+
+
+def _loaded_models() -> List[str]:
+    """Names of optional models already resident in this process (for /health)."""
+    s = _S
+    return [
+        name
+        for name, obj in (("gliner", s.gliner), ("nli", s.nli), ("embedder", s.embedder))
+        if obj is not None
+    ]
+
+
+# -----------------------------
+# GLiNER2 NER (optional -- requires requirements-full.txt)
+# -----------------------------
 
 
 def _get_gliner():
-    global _gliner_model
-    if _gliner_model is not None:
-        return _gliner_model
+    s = _S
+    if s.gliner is not None:
+        return s.gliner
     if os.getenv("SKIP_GLINER", "1").lower() in ("1", "true", "yes"):
         return None
     gliner_id = os.getenv("GLINER_MODEL", "").strip()
     if not gliner_id:
         return None
-    try:
-        from gliner2 import GLiNER2
-        _gliner_model = GLiNER2.from_pretrained(gliner_id)
-        return _gliner_model
-    except Exception:
-        return None
-
-
-def _extract_entities_gliner(context: List[Dict[str, Any]]) -> List[str]:
-    """First-pass NER on context text. Returns empty list if GLiNER unavailable."""
-    model = _get_gliner()
-    if model is None:
-        return []
-    text_parts: List[str] = []
+    # Double-checked under a lock: concurrent first requests must not each
+    # load a multi-hundred-MB checkpoint into memory.
+    with s.gliner_lock:
+        if s.gliner is not None:
+            return s.gliner
+        try:
+            from gliner2 import GLiNER2
+            s.gliner = GLiNER2.from_pretrained(gliner_id)
+            return s.gliner
+        except Exception:
+            return None
+
+
+# Per-event and total character caps on the text handed to GLiNER
+_GLINER_EVENT_CHAR_CAP = 8000
+_GLINER_TEXT_CHAR_CAP = 32000
+
+
+def _gliner_text_from_context(context: List[Dict[str, Any]]) -> str:
+    """Join event text for NER in one pass, stopping at the total char cap.
+
+    Tracking the running budget avoids materializing hundreds of KB of
+    slices only to throw away everything past the cap.
+    """
+    parts: List[str] = []
+    total = 0
     for ev in context:
         if not isinstance(ev, dict):
             continue
+        text: Optional[str] = None
         payload = ev.get("payload") or ev.get("data", {}).get("payload") or ev.get("data") or {}
         if isinstance(payload, dict):
             for key in ("content", "text", "excerpt", "body"):
                 v = payload.get(key)
                 if v and isinstance(v, str):
-                    text_parts.append(v[:8000])
+                    text = v
                     break
-        if isinstance(ev.get("payload"), str):
-            text_parts.append(str(ev["payload"])[:8000])
-    if not text_parts:
+        if text is None and isinstance(ev.get("payload"), str):
+            text = ev["payload"]
+        if not text:
+            continue
+        if parts:
+            if total + 2 >= _GLINER_TEXT_CHAR_CAP:
+                break
+            total += 2  # "\n\n" separator
+        limit = min(_GLINER_EVENT_CHAR_CAP, _GLINER_TEXT_CHAR_CAP - total)
+        # Slice only when the event actually overflows; short texts (the
+        # common case) are appended without copying.
+        chunk = text if len(text) <= limit else text[:limit]
+        parts.append(chunk)
+        total += len(chunk)
+        if total >= _GLINER_TEXT_CHAR_CAP:
+            break
+    return "\n\n".join(parts)
+
+
+def _extract_entities_gliner(context: List[Dict[str, Any]]) -> List[str]:
+    """First-pass NER on context text. Returns empty list if GLiNER unavailable."""
+    model = _get_gliner()
+    if model is None:
+        return []
+    text = _gliner_text_from_context(context)
+    if not text:
         return []
-    text = "\n\n".join(text_parts)[:32000]
     try:
         labels = ["person", "organization", "location", "date", "amount", "document", "concept"]
         raw = model.extract_entities(text, labels) if hasattr(model, "extract_entities") else getattr(model, "predict_entities", lambda t, l: {})(text, labels)
@@ -180,45 +763,129 @@ def _extract_entities_gliner(context: List[Dict[str, Any]]) -> List[str]:
 # NLI contradiction detection (optional -- requires requirements-full.txt)
 # -----------------------------
 
-_nli_model = None
-
-
 def _get_nli():
-    global _nli_model
-    if _nli_model is not None:
-        return _nli_model
+    s = _S
+    if s.nli is not None:
+        return s.nli
     if os.getenv("SKIP_NLI", "1").lower() in ("1", "true", "yes"):
         return None
     nli_id = os.getenv("NLI_MODEL", "").strip()
     if not nli_id:
         return None
-    try:
-        from sentence_transformers import CrossEncoder
-        _nli_model = CrossEncoder(nli_id)
-        return _nli_model
-    except Exception:
+    with s.nli_lock:
+        if s.nli is not None:
+            return s.nli
+        try:
+            from sentence_transformers import CrossEncoder
+            model = CrossEncoder(nli_id)
+            # Half precision on CUDA by default (tensor cores, halved memory
+            # bandwidth); FACTS_NLI_FP16=0 keeps fp32.
+            if os.getenv("FACTS_NLI_FP16", "1").lower() in ("1", "true", "yes"):
+                try:
+                    import torch
+                    if torch.cuda.is_available():
+                        model.model.half().to("cuda")
+                except Exception:
+                    pass
+            s.nli = model
+            return s.nli
+        except Exception:
+            return None
+
+
+def _get_embedder():
+    """Optional sentence encoder used to pre-filter claim pairs before NLI."""
+    s = _S
+    if s.embedder is not None:
+        return s.embedder
+    if os.getenv("SKIP_EMBED", "1").lower() in ("1", "true", "yes"):
         return None
-
-
-def _detect_contradictions_nli(claims: List[str], max_pairs: int = 20) -> List[str]:
-    """Run NLI on claim pairs. Returns empty list if NLI unavailable."""
-    model = _get_nli()
-    if model is None or len(claims) < 2:
-        return []
+    embed_id = os.getenv("EMBED_MODEL", "").strip()
+    if not embed_id:
+        return None
+    with s.embedder_lock:
+        if s.embedder is not None:
+            return s.embedder
+        try:
+            from sentence_transformers import SentenceTransformer
+            s.embedder = SentenceTransformer(embed_id)
+            return s.embedder
+        except Exception:
+            return None
+
+
+_EMBED_SIM_THRESHOLD = float(os.getenv("FACTS_EMBED_SIM", "0.6"))
+
+
+def _similar_pairs(claims: List[str], max_pairs: int, embedder) -> List[Tuple[str, str]]:
+    """Claim pairs ranked by embedding cosine similarity above the threshold.
+
+    Unrelated sentences cannot contradict, so only the most similar pairs are
+    worth the (much more expensive) cross-encoder forward pass.
+    """
+    import numpy as np
+
+    emb = embedder.encode(claims, batch_size=32, convert_to_numpy=True, normalize_embeddings=True)
+    sim = emb @ emb.T
+    idx_i, idx_j = np.triu_indices(len(claims), k=1)
+    sims = sim[idx_i, idx_j]
+    sel = np.flatnonzero(sims > _EMBED_SIM_THRESHOLD)
+    if len(sel) > max_pairs:
+        # O(n) top-k: only the cut needs finding, the cross-encoder doesn't
+        # care about ordering within the selected pairs.
+        sel = sel[np.argpartition(-sims[sel], max_pairs - 1)[:max_pairs]]
+    return [(claims[idx_i[k]], claims[idx_j[k]]) for k in sel]
+
+
+def _claim_pairs(claims: List[str], max_pairs: int) -> List[Tuple[str, str]]:
+    """Candidate pairs for NLI: embedding-prefiltered when an encoder is configured."""
+    embedder = _get_embedder()
+    if embedder is not None:
+        try:
+            return _similar_pairs(claims, max_pairs, embedder)
+        except Exception:
+            pass
     pairs: List[Tuple[str, str]] = []
     for i in range(min(len(claims), 20)):
         for j in range(i + 1, min(len(claims), 20)):
             if len(pairs) >= max_pairs:
                 break
-            a, b = claims[i], claims[j]
-            if isinstance(a, str) and isinstance(b, str) and a.strip() and b.strip():
-                pairs.append((a, b))
+            pairs.append((claims[i], claims[j]))
         if len(pairs) >= max_pairs:
             break
+    return pairs
+
+
+def _detect_contradictions_nli(claims: List[str], max_pairs: int = 20) -> List[str]:
+    """Run NLI on claim pairs. Returns empty list if NLI unavailable."""
+    model = _get_nli()
+    if model is None or len(claims) < 2:
+        return []
+    # Dedupe and drop blank/non-string claims once, instead of per pair
+    claims = [c for c in dict.fromkeys(claims) if isinstance(c, str) and c.strip()]
+    if len(claims) < 2:
+        return []
+    pairs = _claim_pairs(claims, max_pairs)
     if not pairs:
         return []
     try:
-        scores = model.predict([(a, b) for a, b in pairs])
+        # One dispatch for all pairs (capped to keep peak memory bounded);
+        # the default batch_size of 32 would split ~50 pairs into multiple
+        # forward passes.
+        scores = model.predict(
+            pairs,
+            batch_size=min(len(pairs), 64),
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        if getattr(scores, "ndim", 0) == 2 and scores.shape[1] >= 3:
+            # (N, 3) label logits: contradiction wins and clears 0.5
+            mask = (scores[:, 0] > scores[:, 1]) & (scores[:, 0] > scores[:, 2]) & (scores[:, 0] > 0.5)
+            return [
+                f"NLI: \"{a[:100]}...\" vs \"{b[:100]}...\""
+                for (a, b), hit in zip(pairs, mask)
+                if hit
+            ]
         out: List[str] = []
         for idx, (a, b) in enumerate(pairs):
             s = scores[idx] if hasattr(scores, "__getitem__") else scores
@@ -229,6 +896,8 @@ def _detect_contradictions_nli(claims: List[str], max_pairs: int = 20) -> List[s
                     out.append(f"NLI: \"{a[:100]}...\" vs \"{b[:100]}...\"")
             elif isinstance(s, (list, tuple)) and len(s) >= 1 and float(s[0]) > 0.5:
                 out.append(f"NLI: \"{a[:100]}...\" vs \"{b[:100]}...\"")
+            elif isinstance(s, (int, float)) and float(s) > 0.5:
+                out.append(f"NLI: \"{a[:100]}...\" vs \"{b[:100]}...\"")
         return out
     except Exception:
         return []
@@ -239,37 +908,55 @@ def _detect_contradictions_nli(claims: List[str], max_pairs: int = 20) -> List[s
 # -----------------------------
 
 
-def _doc_titles_from_context(context: List[Dict[str, Any]]) -> List[str]:
-    seen: set = set()
-    out: List[str] = []
+def _iter_doc_titles(context: List[Dict[str, Any]]):
+    """Yield document titles from context events (may repeat; callers dedupe)."""
     for ev in context:
         if not isinstance(ev, dict):
             continue
         payload = ev.get("payload") or ev.get("data", {}).get("payload") or ev.get("data") or {}
         if isinstance(payload, dict):
             title = payload.get("title") or payload.get("filename") or payload.get("source")
-            if title and isinstance(title, str) and title not in seen:
-                seen.add(title)
-                out.append(title)
+            if title and isinstance(title, str):
+                yield title
         for key in ("title", "filename"):
             v = ev.get(key)
-            if v and isinstance(v, str) and v not in seen:
-                seen.add(v)
-                out.append(v)
-    return out
+            if v and isinstance(v, str):
+                yield v
+
+
+def _doc_titles_from_context(context: List[Dict[str, Any]]) -> List[str]:
+    return list(dict.fromkeys(_iter_doc_titles(context)))
+
+
+def _changed_as_set(new_list: List[str], old_list: List[str]) -> bool:
+    """True when the two lists differ as sets.
+
+    Identical lists mean unchanged without allocating any sets (the common
+    case when the LLM returns stable output); anything else falls through to
+    the exact set comparison, so ordering and duplicate-count differences
+    don't count as drift.
+    """
+    if new_list == old_list:
+        return False
+    return set(new_list) != set(old_list)
 
 
 def compute_drift(
     new: Facts,
     old: Optional[Dict[str, Any]],
     context: Optional[List[Dict[str, Any]]] = None,
+    doc_titles: Optional[List[str]] = None,
 ) -> Drift:
+    # Callers that already walked the context (extract path) pass doc_titles
+    # so the event tree is only traversed once per request.
+    if doc_titles is None:
+        doc_titles = _doc_titles_from_context(context) if context else []
     if not old:
         refs: List[Dict[str, Any]] = []
-        if context:
-            for doc in _doc_titles_from_context(context):
-                refs.append({"type": "context_doc", "doc": doc})
-        return Drift(
+        for doc in doc_titles:
+            refs.append({"type": "context_doc", "doc": doc})
+        # model_construct skips validation; every field here is built locally.
+        return Drift.model_construct(
             level="none",
             types=[],
             notes=["initial snapshot"],
@@ -280,17 +967,19 @@ def compute_drift(
     drift_types: List[str] = []
     references: List[Dict[str, Any]] = []
 
-    if context:
-        for doc in _doc_titles_from_context(context):
-            references.append({"type": "context_doc", "doc": doc})
+    for doc in doc_titles:
+        references.append({"type": "context_doc", "doc": doc})
 
-    if set(new.claims) != set(old.get("claims") or []):
+    # Bind model fields to locals once; each attribute access walks
+    # pydantic's instance dict.
+    contradictions = new.contradictions
+    if _changed_as_set(new.claims, old.get("claims") or []):
         drift_types.append("factual")
-    if set(new.goals) != set(old.get("goals") or []):
+    if _changed_as_set(new.goals, old.get("goals") or []):
         drift_types.append("goal")
-    if new.contradictions:
+    if contradictions:
         drift_types.append("contradiction")
-        for c in new.contradictions:
+        for c in contradictions:
             if isinstance(c, str) and c.strip():
                 references.append({"type": "contradiction", "excerpt": c.strip()})
     if new.confidence < (old.get("confidence") or 1.0):
@@ -302,7 +991,7 @@ def compute_drift(
     if "contradiction" in drift_types:
         level = "high"
 
-    return Drift(
+    return Drift.model_construct(
         level=level,
         types=drift_types,
         notes=["automatic structured drift detection"],
@@ -316,9 +1005,43 @@ def compute_drift(
 # -----------------------------
 
 
+# Keys the LLM tends to wrap list items in, in priority order.
+_DICT_KEYS = ("claim", "risk", "assumption", "contradiction", "goal", "text", "entity")
+
+
+def _item_from_str(item: str) -> str:
+    stripped = item.strip()
+    return stripped if stripped else item
+
+
+def _item_from_dict(item: Dict[str, Any]) -> str:
+    s = None
+    for key in _DICT_KEYS:
+        v = item.get(key)
+        if v:
+            s = v
+            break
+    else:
+        for v in item.values():
+            if isinstance(v, str):
+                s = v
+                break
+    if s and isinstance(s, str):
+        return s.strip() or s
+    return str(item)
+
+
+# orjson only ever produces exact str/dict, so type() dispatch is safe here
+# and skips the isinstance chain per item.
+_ITEM_DISPATCH = {str: _item_from_str, dict: _item_from_dict}
+
+
 def _to_string_list(val: Any) -> List[str]:
-    if val is None:
+    if val is None or val == []:
         return []
+    if isinstance(val, list):
+        dispatch = _ITEM_DISPATCH
+        return [dispatch.get(type(item), str)(item) for item in val]
     if isinstance(val, dict):
         flat: List[str] = []
         for v in val.values():
@@ -330,24 +1053,6 @@ def _to_string_list(val: Any) -> List[str]:
             else:
                 flat.append(str(v))
         return flat
-    if isinstance(val, list):
-        out: List[str] = []
-        for item in val:
-            if isinstance(item, str):
-                out.append(item.strip() if item.strip() else item)
-            elif isinstance(item, dict):
-                s = (
-                    item.get("claim") or item.get("risk") or item.get("assumption")
-                    or item.get("contradiction") or item.get("goal") or item.get("text")
-                    or item.get("entity") or (next((v for v in item.values() if isinstance(v, str)), None))
-                )
-                if s and isinstance(s, str):
-                    out.append(s.strip() or s)
-                else:
-                    out.append(str(item))
-            else:
-                out.append(str(item))
-        return out
     return [str(val)]
 
 
@@ -356,33 +1061,164 @@ def _to_string_list(val: Any) -> List[str]:
 # -----------------------------
 
 
-def extract_facts_and_drift(
+def _build_prompts(
     context: List[Dict[str, Any]],
     previous_facts: Optional[Dict[str, Any]],
-) -> Tuple[Dict[str, Any], Dict[str, Any]]:
-    context_limited = _truncate_context_for_prompt(context, EXTRACTION_CONTEXT_MAX_CHARS)
-
-    prompt_context = json.dumps(context_limited, separators=(",", ":"), ensure_ascii=False)
-    prompt_previous = json.dumps(previous_facts, separators=(",", ":"), ensure_ascii=False) if previous_facts else "{}"
-
-    # Optional first-pass NER (requires requirements-full.txt + GLINER_MODEL set)
-    gliner_entities: List[str] = _extract_entities_gliner(context_limited)
+) -> Tuple[List[Dict[str, Any]], str, str]:
+    """Dedupe/trim/truncate context and serialize both prompt halves. Returns (context_limited, prompt_context, prompt_previous)."""
+    context_limited = _truncate_context_for_prompt(_trim_context(_dedupe_events(context)), EXTRACTION_CONTEXT_MAX_CHARS)
+    prompt_context = orjson.dumps(context_limited).decode()
+    prompt_previous = orjson.dumps(previous_facts).decode() if previous_facts else "{}"
+    return context_limited, prompt_context, prompt_previous
 
-    # LLM extraction (OpenAI API or Ollama)
-    facts_json_str = _call_llm(prompt_context, prompt_previous)
 
-    # Parse JSON (strip optional markdown code fence)
+def _parse_facts_json(facts_json_str: str) -> Facts:
+    """Parse the LLM reply (stripping an optional markdown code fence) into a Facts model."""
     raw = facts_json_str.strip()
     if raw.startswith("```"):
         raw = raw.split("\n", 1)[-1] if "\n" in raw else raw[3:]
         raw = raw.rsplit("```", 1)[0].strip()
-    facts_dict = json.loads(raw)
+    facts_dict = orjson.loads(raw)
 
     for key in ("entities", "claims", "risks", "assumptions", "contradictions", "goals"):
         facts_dict[key] = _to_string_list(facts_dict.get(key))
 
-    facts = Facts(**facts_dict)
+    return Facts(**facts_dict)
 
+
+# Optional request-coalescing micro-batcher (see batcher.py). Off by default;
+# FACTS_MICROBATCH=1 sends concurrent extracts as one multi-context call.
+_MICROBATCH_ENABLED = os.getenv("FACTS_MICROBATCH", "").lower() in ("1", "true", "yes")
+
+
+async def _call_llm_multi_async(items: List[Tuple[str, str]]) -> List[str]:
+    """One completion covering several (context, previous) prompt pairs.
+
+    The model must reply {"results": [...]} with exactly one facts object per
+    item, in order; each slot is re-serialized to its own JSON string so
+    downstream parsing matches the single-call path.
+    """
+    client = _get_async_client()
+    _, model = _client_kwargs()
+    sections = []
+    for i, (prompt_context, prompt_previous) in enumerate(items):
+        sections.append(
+            f"Item {i + 1}:\nContext (recent events as JSON):\n{prompt_context}\n\n"
+            f"Previous facts (JSON):\n{prompt_previous}"
+        )
+    user_content = (
+        f"Extract structured facts for each of the following {len(items)} independent items.\n\n"
+        + "\n\n".join(sections)
+        + f"\n\nReply with a single JSON object only (no markdown, no explanation) of the form"
+        f' {{"results": [...]}} where results has exactly {len(items)} objects, one per item in'
+        " order. Each object has these keys: entities (list of strings), claims (list), risks"
+        " (list), assumptions (list), contradictions (list), goals (list), confidence (float 0-1)."
+    )
+    resp = await client.chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": user_content}],
+        response_format={"type": "json_object"},
+    )
+    raw = (resp.choices[0].message.content or "{}").strip()
+    data = orjson.loads(raw)
+    results = data.get("results") if isinstance(data, dict) else data
+    if not isinstance(results, list) or len(results) != len(items):
+        raise ValueError(f"batched LLM reply did not contain {len(items)} results")
+    return [orjson.dumps(r).decode() for r in results]
+
+
+def _get_batcher():
+    s = _S
+    if s.batcher is None:
+        with s.client_lock:
+            if s.batcher is None:
+                from batcher import MicroBatcher
+                s.batcher = MicroBatcher(_call_llm_multi_async, _call_llm_async)
+    return s.batcher
+
+
+# Malformed LLM output triggers a feedback re-call instead of failing the
+# whole request (and with it the client's retry of GLiNER/NLI/everything).
+_LLM_PARSE_RETRIES = max(0, int(os.getenv("FACTS_PARSE_RETRIES", "2")))
+
+
+def _parse_feedback(raw: str, error: Exception) -> List[Dict[str, str]]:
+    return [
+        {"role": "assistant", "content": raw},
+        {"role": "user", "content": f"Your output had error: {error}. Fix and retry."},
+    ]
+
+
+def _extract_facts_with_retries(prompt_context: str, prompt_previous: str) -> Tuple[Facts, str]:
+    feedback: Optional[List[Dict[str, str]]] = None
+    for attempt in range(_LLM_PARSE_RETRIES + 1):
+        try:
+            raw = _call_llm(prompt_context, prompt_previous, feedback)
+        except LLMStreamError as e:
+            if attempt >= _LLM_PARSE_RETRIES:
+                raise
+            feedback = _parse_feedback(e.partial, e)
+            time.sleep(1.0 * (attempt + 1))
+            continue
+        try:
+            return _parse_facts_json(raw), raw
+        except (ValueError, ValidationError) as e:
+            if attempt >= _LLM_PARSE_RETRIES:
+                raise
+            feedback = _parse_feedback(raw, e)
+            time.sleep(1.0 * (attempt + 1))
+    raise RuntimeError("unreachable")
+
+
+async def _extract_facts_with_retries_async(prompt_context: str, prompt_previous: str) -> Tuple[Facts, str]:
+    feedback: Optional[List[Dict[str, str]]] = None
+    for attempt in range(_LLM_PARSE_RETRIES + 1):
+        try:
+            # Feedback retries are per-conversation, so they bypass the batcher.
+            if _MICROBATCH_ENABLED and feedback is None:
+                raw = await _get_batcher().call(prompt_context, prompt_previous)
+            else:
+                raw = await _call_llm_async(prompt_context, prompt_previous, feedback)
+        except LLMStreamError as e:
+            if attempt >= _LLM_PARSE_RETRIES:
+                raise
+            feedback = _parse_feedback(e.partial, e)
+            await asyncio.sleep(1.0 * (attempt + 1))
+            continue
+        try:
+            return _parse_facts_json(raw), raw
+        except (ValueError, ValidationError) as e:
+            if attempt >= _LLM_PARSE_RETRIES:
+                raise
+            feedback = _parse_feedback(raw, e)
+            await asyncio.sleep(1.0 * (attempt + 1))
+    raise RuntimeError("unreachable")
+
+
+def _parse_cached_facts(cache_key: str) -> Optional[Facts]:
+    """Return Facts parsed from a cached raw reply, evicting the entry if it no longer validates."""
+    cached = _extract_cache_get(cache_key)
+    if cached is None:
+        return None
+    try:
+        return _parse_facts_json(cached)
+    except Exception:
+        _extract_cache.pop(cache_key, None)
+        return None
+
+
+def _finalize_facts(
+    facts: Facts,
+    gliner_entities: List[str],
+    previous_facts: Optional[Dict[str, Any]],
+    context: List[Dict[str, Any]],
+    nli_contradictions: Optional[List[str]] = None,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Merge NER entities, run NLI, stamp/hash the facts and compute drift.
+
+    The async path passes nli_contradictions precomputed off the event loop;
+    when None, NLI runs inline (sync path).
+    """
     if gliner_entities:
         existing = set(facts.entities or [])
         for e in gliner_entities:
@@ -391,13 +1227,88 @@ def extract_facts_and_drift(
                 facts.entities.append(e)
 
     # Optional NLI contradiction detection (requires requirements-full.txt + NLI_MODEL set)
-    nli_contradictions = _detect_contradictions_nli(facts.claims or [])
+    if nli_contradictions is None:
+        nli_contradictions = _detect_contradictions_nli(facts.claims or [])
     if nli_contradictions:
         facts.contradictions = list(facts.contradictions or []) + nli_contradictions
 
-    facts.updated_at = datetime.utcnow().isoformat() + "Z"
-    facts.hash = stable_hash(facts.model_dump())
+    facts.updated_at = _iso_utc_now()
+    # One model_dump serves both the hash input and the response payload.
+    dumped = facts.model_dump()
+    facts.hash = stable_hash({k: v for k, v in dumped.items() if k != "hash"})
+    dumped["hash"] = facts.hash
+
+    _facts_by_hash_put(facts.hash, dumped)
+
+    drift = compute_drift(facts, previous_facts, context, doc_titles=_doc_titles_from_context(context))
+
+    return dumped, drift.model_dump()
+
+
+def extract_facts_and_drift(
+    context: List[Dict[str, Any]],
+    previous_facts: Optional[Union[Dict[str, Any], str]],
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    previous_facts = _resolve_previous_facts(previous_facts)
+    context_limited, prompt_context, prompt_previous = _build_prompts(context, previous_facts)
+
+    result_key = _result_cache_key(context_limited, previous_facts)
+    cached_result = _result_cache_get(result_key)
+    if cached_result is not None:
+        return cached_result
+
+    # Optional first-pass NER (requires requirements-full.txt + GLINER_MODEL set)
+    gliner_entities: List[str] = _extract_entities_gliner(context_limited)
 
-    drift = compute_drift(facts, previous_facts, context)
+    # LLM extraction (OpenAI API or Ollama), skipped entirely on a cache hit
+    cache_key = _extraction_cache_key(_get_model_info()[0], prompt_context, prompt_previous)
+    facts = _parse_cached_facts(cache_key)
+    if facts is None:
+        facts, facts_json_str = _extract_facts_with_retries(prompt_context, prompt_previous)
+        _extract_cache_put(cache_key, facts_json_str)
 
-    return facts.model_dump(), drift.model_dump()
+    result = _finalize_facts(facts, gliner_entities, previous_facts, context)
+    _result_cache_put(result_key, *result)
+    return result
+
+
+async def extract_facts_and_drift_async(
+    context: List[Dict[str, Any]],
+    previous_facts: Optional[Union[Dict[str, Any], str]],
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Async variant of extract_facts_and_drift; the LLM round-trip awaits instead of blocking."""
+    previous_facts = _resolve_previous_facts(previous_facts)
+    context_limited, prompt_context, prompt_previous = _build_prompts(context, previous_facts)
+
+    result_key = _result_cache_key(context_limited, previous_facts)
+    cached_result = _result_cache_get(result_key)
+    if cached_result is not None:
+        return cached_result
+
+    cache_key = _extraction_cache_key(_get_model_info()[0], prompt_context, prompt_previous)
+    facts = _parse_cached_facts(cache_key)
+    # Skip the threadpool hop entirely in the common SKIP_GLINER config
+    ner_enabled = _get_gliner() is not None
+    if facts is None:
+        if ner_enabled:
+            # NER runs on a thread (torch releases the GIL) while the LLM call
+            # is in flight, so total latency is max(GLiNER, LLM), not the sum.
+            gliner_entities, (facts, facts_json_str) = await asyncio.gather(
+                _run_nn(_extract_entities_gliner, context_limited),
+                _extract_facts_with_retries_async(prompt_context, prompt_previous),
+            )
+        else:
+            gliner_entities = []
+            facts, facts_json_str = await _extract_facts_with_retries_async(prompt_context, prompt_previous)
+        _extract_cache_put(cache_key, facts_json_str)
+    else:
+        gliner_entities = await _run_nn(_extract_entities_gliner, context_limited) if ner_enabled else []
+
+    # NLI is torch inference too: run it on a gated worker thread instead of
+    # blocking the event loop inside _finalize_facts.
+    nli_contradictions = (
+        await _run_nn(_detect_contradictions_nli, facts.claims or []) if _get_nli() is not None else []
+    )
+    result = _finalize_facts(facts, gliner_entities, previous_facts, context, nli_contradictions)
+    _result_cache_put(result_key, *result)
+    return result
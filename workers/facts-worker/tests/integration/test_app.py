@@ -12,11 +12,9 @@ def client():
 
 
 class TestExtractEndpoint:
-    @patch("rlm_facts._get_program")
-    def test_extract_empty_context_mocked(self, mock_get_program: MagicMock, client: TestClient):
-        mock_program = MagicMock()
-        mock_program.return_value.facts_json = '''{"entities": [], "claims": [], "risks": [], "assumptions": [], "contradictions": [], "goals": [], "confidence": 1.0}'''
-        mock_get_program.return_value = mock_program
+    @patch("rlm_facts._call_llm_async")
+    def test_extract_empty_context_mocked(self, mock_call_llm: MagicMock, client: TestClient):
+        mock_call_llm.return_value = '''{"entities": [], "claims": [], "risks": [], "assumptions": [], "contradictions": [], "goals": [], "confidence": 1.0}'''
         resp = client.post(
             "/extract",
             json={"context": [], "previous_facts": None},
@@ -30,11 +28,9 @@ class TestExtractEndpoint:
         assert data["drift"]["level"] == "none"
         assert "types" in data["drift"]
 
-    @patch("rlm_facts._get_program")
-    def test_extract_with_context_mocked(self, mock_get_program: MagicMock, client: TestClient):
-        mock_program = MagicMock()
-        mock_program.return_value.facts_json = '''{"entities": ["RustFS"], "claims": ["We use RustFS"], "risks": [], "assumptions": [], "contradictions": [], "goals": ["storage"], "confidence": 0.85}'''
-        mock_get_program.return_value = mock_program
+    @patch("rlm_facts._call_llm_async")
+    def test_extract_with_context_mocked(self, mock_call_llm: MagicMock, client: TestClient):
+        mock_call_llm.return_value = '''{"entities": ["RustFS"], "claims": ["We use RustFS"], "risks": [], "assumptions": [], "contradictions": [], "goals": ["storage"], "confidence": 0.85}'''
         resp = client.post(
             "/extract",
             json={
@@ -50,11 +46,9 @@ class TestExtractEndpoint:
         assert data["drift"]["facts_hash"] == data["facts"]["hash"]
         assert "types" in data["drift"]
 
-    @patch("rlm_facts._get_program")
-    def test_extract_with_previous_facts_returns_drift(self, mock_get_program: MagicMock, client: TestClient):
-        mock_program = MagicMock()
-        mock_program.return_value.facts_json = '''{"entities": [], "claims": ["First"], "risks": [], "assumptions": [], "contradictions": [], "goals": [], "confidence": 0.9}'''
-        mock_get_program.return_value = mock_program
+    @patch("rlm_facts._call_llm_async")
+    def test_extract_with_previous_facts_returns_drift(self, mock_call_llm: MagicMock, client: TestClient):
+        mock_call_llm.return_value = '''{"entities": [], "claims": ["First"], "risks": [], "assumptions": [], "contradictions": [], "goals": [], "confidence": 0.9}'''
         resp1 = client.post(
             "/extract",
             json={"context": [{"text": "First event."}], "previous_facts": None},
@@ -62,8 +56,7 @@ class TestExtractEndpoint:
         assert resp1.status_code == 200
         prev = resp1.json()["facts"]
 
-        mock_program.return_value.facts_json = '''{"entities": [], "claims": ["First", "Second"], "risks": [], "assumptions": [], "contradictions": [], "goals": ["evolve"], "confidence": 0.8}'''
-        mock_get_program.return_value = mock_program
+        mock_call_llm.return_value = '''{"entities": [], "claims": ["First", "Second"], "risks": [], "assumptions": [], "contradictions": [], "goals": ["evolve"], "confidence": 0.8}'''
         resp2 = client.post(
             "/extract",
             json={
@@ -75,3 +68,58 @@ class TestExtractEndpoint:
         data = resp2.json()
         assert data["drift"]["level"] in ("none", "low", "high")
         assert "types" in data["drift"]
+
+
+class TestPreviousFactsByHash:
+    @patch("rlm_facts._call_llm_async")
+    def test_previous_facts_hash_reference(self, mock_call_llm: MagicMock, client: TestClient):
+        mock_call_llm.return_value = '''{"entities": [], "claims": ["By hash"], "risks": [], "assumptions": [], "contradictions": [], "goals": [], "confidence": 0.9}'''
+        resp1 = client.post(
+            "/extract",
+            json={"context": [{"text": "Hash ref event."}], "previous_facts": None},
+        )
+        assert resp1.status_code == 200
+        facts_hash = resp1.json()["facts"]["hash"]
+
+        resp2 = client.post(
+            "/extract",
+            json={"context": [{"text": "Hash ref event."}, {"text": "Next."}], "previous_facts": facts_hash},
+        )
+        assert resp2.status_code == 200
+        assert resp2.json()["drift"]["level"] in ("none", "low", "high")
+
+    def test_unknown_previous_facts_hash_errors(self, client: TestClient):
+        resp = client.post(
+            "/extract",
+            json={"context": [{"text": "whatever"}], "previous_facts": "not-a-known-hash"},
+        )
+        assert resp.status_code == 422
+        data = resp.json()
+        assert data["code"] == "unknown_previous_facts_hash"
+        assert "unknown previous_facts hash" in data["error"]
+
+
+class TestExtractBatchEndpoint:
+    @patch("rlm_facts._call_llm_async")
+    def test_extract_batch_mocked(self, mock_call_llm: MagicMock, client: TestClient):
+        mock_call_llm.return_value = '''{"entities": [], "claims": ["batched"], "risks": [], "assumptions": [], "contradictions": [], "goals": [], "confidence": 0.9}'''
+        resp = client.post(
+            "/extract_batch",
+            json={
+                "items": [
+                    {"context": [{"text": "Batch item one."}], "previous_facts": None},
+                    {"context": [{"text": "Batch item two."}], "previous_facts": None},
+                ]
+            },
+        )
+        assert resp.status_code == 200
+        results = resp.json()["results"]
+        assert len(results) == 2
+        for item in results:
+            assert item["facts"]["version"] == 2
+            assert item["drift"]["level"] in ("none", "low", "high")
+
+    def test_extract_batch_empty_items(self, client: TestClient):
+        resp = client.post("/extract_batch", json={"items": []})
+        assert resp.status_code == 200
+        assert resp.json()["results"] == []
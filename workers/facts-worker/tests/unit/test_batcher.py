@@ -0,0 +1,97 @@
+import asyncio
+
+from batcher import MicroBatcher
+
+
+class TestMicroBatcher:
+    def test_coalesces_concurrent_calls(self):
+        multi_batches = []
+
+        async def multi(items):
+            multi_batches.append(len(items))
+            return [f"result-{i}" for i in range(len(items))]
+
+        async def single(ctx, prev):
+            raise AssertionError("single call should not be used")
+
+        async def main():
+            b = MicroBatcher(multi, single, max_batch=4, window_ms=50)
+            return await asyncio.gather(*(b.call(f"ctx{i}", "{}") for i in range(3)))
+
+        results = asyncio.run(main())
+        assert results == ["result-0", "result-1", "result-2"]
+        assert multi_batches == [3]
+
+    def test_single_item_skips_multi_call(self):
+        async def multi(items):
+            raise AssertionError("multi call should not be used for one item")
+
+        async def single(ctx, prev):
+            return f"single:{ctx}"
+
+        async def main():
+            b = MicroBatcher(multi, single, max_batch=4, window_ms=1)
+            return await b.call("only", "{}")
+
+        assert asyncio.run(main()) == "single:only"
+
+    def test_batches_dispatch_concurrently(self):
+        started = []
+        release = None
+
+        async def multi(items):
+            started.append(len(items))
+            await release.wait()
+            return ["r"] * len(items)
+
+        async def single(ctx, prev):
+            raise AssertionError("single call should not be used")
+
+        async def main():
+            nonlocal release
+            release = asyncio.Event()
+            b = MicroBatcher(multi, single, max_batch=2, window_ms=1)
+            first = [asyncio.ensure_future(b.call(f"a{i}", "{}")) for i in range(2)]
+            while not started:
+                await asyncio.sleep(0.005)
+            # the first batch is blocked in multi(); the second must still dispatch
+            second = [asyncio.ensure_future(b.call(f"b{i}", "{}")) for i in range(2)]
+            while len(started) < 2:
+                await asyncio.sleep(0.005)
+            release.set()
+            return await asyncio.gather(*first, *second)
+
+        results = asyncio.run(asyncio.wait_for(main(), timeout=5))
+        assert results == ["r"] * 4
+        assert started == [2, 2]
+
+    def test_wrong_length_falls_back_to_single_calls(self):
+        async def multi(items):
+            return ["just-one"]
+
+        async def single(ctx, prev):
+            return f"single:{ctx}"
+
+        async def main():
+            b = MicroBatcher(multi, single, max_batch=4, window_ms=50)
+            return await asyncio.gather(*(b.call(f"ctx{i}", "{}") for i in range(2)))
+
+        assert asyncio.run(main()) == ["single:ctx0", "single:ctx1"]
+
+    def test_single_call_failure_propagates(self):
+        async def multi(items):
+            raise RuntimeError("multi down")
+
+        async def single(ctx, prev):
+            raise RuntimeError("llm down")
+
+        async def main():
+            b = MicroBatcher(multi, single, max_batch=4, window_ms=1)
+            return await b.call("ctx", "{}")
+
+        try:
+            asyncio.run(main())
+        except RuntimeError as e:
+            assert "llm down" in str(e)
+        else:
+            raise AssertionError("expected RuntimeError")
@@ -4,8 +4,15 @@ from rlm_facts import (
     stable_hash,
     compute_drift,
     extract_facts_and_drift,
+    clear_extraction_cache,
     Facts,
     Drift,
+    LLMStreamError,
+    _trim_context,
+    _truncate_context_for_prompt,
+    _dedupe_events,
+    _gliner_text_from_context,
+    _StreamAccumulator,
 )
 
 
@@ -78,12 +85,185 @@ class TestComputeDrift:
         assert "entropy" in drift.types
 
 
+class TestTrimContext:
+    def test_keeps_last_max_events(self):
+        context = [{"text": f"ev{i}"} for i in range(10)]
+        out = _trim_context(context, max_events=3, max_chars_per_event=100)
+        assert out == context[-3:]
+
+    def test_truncates_long_text_fields(self):
+        context = [{"text": "x" * 100, "payload": {"content": "y" * 100}}]
+        out = _trim_context(context, max_events=10, max_chars_per_event=10)
+        assert out[0]["text"] == "x" * 10
+        assert out[0]["payload"]["content"] == "y" * 10
+        # original events are untouched
+        assert len(context[0]["text"]) == 100
+
+    def test_short_events_pass_through_unchanged(self):
+        context = [{"text": "short"}]
+        out = _trim_context(context, max_events=10, max_chars_per_event=100)
+        assert out[0] is context[0]
+
+
+class TestTruncateContextForPrompt:
+    def test_returns_context_when_it_fits(self):
+        context = [{"text": "a"}, {"text": "b"}]
+        assert _truncate_context_for_prompt(context, 1000) is context
+
+    def test_keeps_newest_suffix_that_fits(self):
+        import orjson
+        context = [{"text": f"event number {i}"} for i in range(20)]
+        out = _truncate_context_for_prompt(context, 100)
+        assert out == context[len(context) - len(out):]
+        assert 0 < len(out) < len(context)
+        assert len(orjson.dumps(out)) <= 100
+
+    def test_single_oversized_event_keeps_newest(self):
+        context = [{"text": "old"}, {"text": "x" * 500}]
+        assert _truncate_context_for_prompt(context, 50) == context[-1:]
+
+    def test_zero_budget_disables_truncation(self):
+        context = [{"text": "a"}]
+        assert _truncate_context_for_prompt(context, 0) is context
+
+
+class TestGlinerTextFromContext:
+    def test_joins_event_text_with_separator(self):
+        context = [{"payload": "first"}, {"payload": {"content": "second"}}]
+        assert _gliner_text_from_context(context) == "first\n\nsecond"
+
+    def test_stops_at_total_char_cap(self, monkeypatch):
+        monkeypatch.setattr("rlm_facts._GLINER_TEXT_CHAR_CAP", 10)
+        context = [{"payload": "x" * 50}, {"payload": "never reached"}]
+        out = _gliner_text_from_context(context)
+        assert out == "x" * 10
+
+
+class TestDedupeEvents:
+    def test_drops_exact_duplicates_keeps_order(self):
+        a, b = {"text": "a"}, {"text": "b"}
+        assert _dedupe_events([a, b, {"text": "a"}, a]) == [a, b]
+
+    def test_key_order_does_not_matter(self):
+        assert _dedupe_events([{"x": 1, "y": 2}, {"y": 2, "x": 1}]) == [{"x": 1, "y": 2}]
+
+
+class TestExtractionCache:
+    def setup_method(self):
+        clear_extraction_cache()
+
+    @patch("rlm_facts._call_llm")
+    def test_identical_request_skips_llm(self, mock_call_llm: MagicMock):
+        mock_call_llm.return_value = '''{"entities": [], "claims": ["cached"], "risks": [], "assumptions": [], "contradictions": [], "goals": [], "confidence": 1.0}'''
+        context = [{"text": "same event"}]
+        facts1, _ = extract_facts_and_drift(context, None)
+        facts2, _ = extract_facts_and_drift(context, None)
+        assert mock_call_llm.call_count == 1
+        assert facts1["claims"] == facts2["claims"] == ["cached"]
+
+    @patch("rlm_facts._call_llm")
+    def test_different_context_calls_llm(self, mock_call_llm: MagicMock):
+        mock_call_llm.return_value = '''{"entities": [], "claims": [], "risks": [], "assumptions": [], "contradictions": [], "goals": [], "confidence": 1.0}'''
+        extract_facts_and_drift([{"text": "event a"}], None)
+        extract_facts_and_drift([{"text": "event b"}], None)
+        assert mock_call_llm.call_count == 2
+
+
+class TestResultCache:
+    def setup_method(self):
+        clear_extraction_cache()
+
+    @patch("rlm_facts._call_llm")
+    def test_hit_skips_pipeline_and_refreshes_timestamp(self, mock_call_llm: MagicMock, monkeypatch):
+        monkeypatch.setattr("rlm_facts._RESULT_CACHE_MAX", 8)
+        monkeypatch.setattr("rlm_facts._EXTRACT_CACHE_MAX", 0)
+        mock_call_llm.return_value = '''{"entities": [], "claims": ["r"], "risks": [], "assumptions": [], "contradictions": [], "goals": [], "confidence": 1.0}'''
+        context = [{"text": "result cached"}]
+        facts1, drift1 = extract_facts_and_drift(context, None)
+        facts2, drift2 = extract_facts_and_drift(context, None)
+        assert mock_call_llm.call_count == 1
+        assert facts2["claims"] == facts1["claims"]
+        assert drift2["facts_hash"] == drift1["facts_hash"]
+        # returned copies are independent of the cached entry
+        facts2["claims"].append("mutated")
+        facts3, _ = extract_facts_and_drift(context, None)
+        assert facts3["claims"] == ["r"]
+
+    @patch("rlm_facts._call_llm")
+    def test_disabled_by_default(self, mock_call_llm: MagicMock, monkeypatch):
+        monkeypatch.setattr("rlm_facts._EXTRACT_CACHE_MAX", 0)
+        mock_call_llm.return_value = '''{"entities": [], "claims": [], "risks": [], "assumptions": [], "contradictions": [], "goals": [], "confidence": 1.0}'''
+        context = [{"text": "no result cache"}]
+        extract_facts_and_drift(context, None)
+        extract_facts_and_drift(context, None)
+        assert mock_call_llm.call_count == 2
+
+
+class TestStreamAccumulator:
+    def test_accumulates_json_chunks(self):
+        acc = _StreamAccumulator()
+        for delta in ('{"claims"', ': ["a"]', "}"):
+            acc.feed(delta)
+        assert acc.result() == '{"claims": ["a"]}'
+
+    def test_rejects_non_json_start(self):
+        acc = _StreamAccumulator()
+        with pytest.raises(LLMStreamError) as exc_info:
+            acc.feed("Sure! Here is the JSON you asked for:")
+        assert "Sure!" in exc_info.value.partial
+
+    def test_done_when_top_level_object_closes(self):
+        acc = _StreamAccumulator()
+        acc.feed('{"claims": ["a"]')
+        assert not acc.done
+        acc.feed("}")
+        assert acc.done
+        acc.feed("Hope that helps!")  # trailing prose is ignored
+        assert acc.result() == '{"claims": ["a"]}'
+
+    def test_braces_inside_strings_do_not_close(self):
+        acc = _StreamAccumulator()
+        acc.feed('{"claims": ["uses {braces} and \\" quotes"]')
+        assert not acc.done
+        acc.feed("}")
+        assert acc.done
+
+    def test_rejects_oversized_stream(self, monkeypatch):
+        monkeypatch.setattr("rlm_facts._STREAM_MAX_BYTES", 10)
+        acc = _StreamAccumulator()
+        with pytest.raises(LLMStreamError):
+            acc.feed('{"claims": ["way past the byte cap"]}')
+
+
+class TestRetryWithFeedback:
+    def setup_method(self):
+        clear_extraction_cache()
+
+    @patch("rlm_facts.time.sleep")
+    @patch("rlm_facts._call_llm")
+    def test_malformed_reply_retried_with_feedback(self, mock_call_llm: MagicMock, mock_sleep: MagicMock):
+        good = '''{"entities": [], "claims": ["fixed"], "risks": [], "assumptions": [], "contradictions": [], "goals": [], "confidence": 0.9}'''
+        mock_call_llm.side_effect = ["this is not json", good]
+        facts, _ = extract_facts_and_drift([{"text": "retry me"}], None)
+        assert facts["claims"] == ["fixed"]
+        assert mock_call_llm.call_count == 2
+        # second call carries the bad reply + error feedback
+        feedback = mock_call_llm.call_args.args[2]
+        assert feedback[0] == {"role": "assistant", "content": "this is not json"}
+        assert "Fix and retry" in feedback[1]["content"]
+
+    @patch("rlm_facts.time.sleep")
+    @patch("rlm_facts._call_llm")
+    def test_persistent_malformed_reply_raises(self, mock_call_llm: MagicMock, mock_sleep: MagicMock):
+        mock_call_llm.return_value = "still not json"
+        with pytest.raises(ValueError):
+            extract_facts_and_drift([{"text": "never valid"}], None)
+
+
 class TestExtractFactsAndDrift:
-    @patch("rlm_facts._get_program")
-    def test_returns_facts_and_drift_mocked(self, mock_get_program: MagicMock):
-        mock_program = MagicMock()
-        mock_program.return_value.facts_json = '''{"entities": [], "claims": ["hello"], "risks": [], "assumptions": [], "contradictions": [], "goals": [], "confidence": 0.9}'''
-        mock_get_program.return_value = mock_program
+    @patch("rlm_facts._call_llm")
+    def test_returns_facts_and_drift_mocked(self, mock_call_llm: MagicMock):
+        mock_call_llm.return_value = '''{"entities": [], "claims": ["hello"], "risks": [], "assumptions": [], "contradictions": [], "goals": [], "confidence": 0.9}'''
         context = [{"text": "hello"}]
         facts, drift = extract_facts_and_drift(context, None)
         assert facts["version"] == 2